@@ -0,0 +1,25 @@
+"""Gunicorn configuration for production deployments.
+
+Runs several worker processes, each with a pool of threads, so slow
+downloads and conversions don't block other requests. Loaded automatically
+when gunicorn is started from the project directory.
+"""
+
+import multiprocessing
+import os
+
+# Bind to all interfaces on the platform-provided port (Render, Heroku, etc.)
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# One worker process per CPU, each handling requests on a thread pool
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Large feeds can take a while to download and convert
+timeout = 120
+
+# Import the app once in the master process; workers are forked from it and
+# share the already-loaded modules (lxml, pyarrow, xlsxwriter, ...) via
+# copy-on-write instead of each importing them again
+preload_app = True